@@ -6,40 +6,245 @@ A fast, robust, and self-contained script using Playwright.
 
 import argparse
 import asyncio
+import base64
+import contextlib
+import hashlib
 import json
+import logging
 import os
 import shutil
+import tempfile
+import threading
+import time
+import zipfile
 from datetime import datetime
+from pathlib import Path, PurePosixPath
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import lxml.etree
+import lxml.html
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
+logger = logging.getLogger(__name__)
+
+# H.264 encoders tried in order for the scroll video: (encoder, pre-input args, video filters, output args)
+H264_ENCODERS = [
+    ("h264_nvenc", [], [], ["-c:v", "h264_nvenc", "-preset", "p5", "-b:v", "8000k"]),
+    ("h264_qsv", [], [], ["-c:v", "h264_qsv", "-preset", "medium", "-b:v", "8000k"]),
+    ("h264_vaapi", ["-vaapi_device", "/dev/dri/renderD128"], ["format=nv12", "hwupload"], ["-c:v", "h264_vaapi", "-b:v", "8000k"]),
+    ("libx264", [], [], ["-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p"]),
+]
+
+# Two-pass constrained-quality VP9 for --video-codec vp9. CRF 36 matched the libx264 entry
+# above on SSIM with a ~10% smaller file on a 720p test scroll, but encodes far more slowly
+VP9_ARGS = ["-c:v", "libvpx-vp9", "-crf", "36", "-b:v", "0", "-row-mt", "1"]
+
+# Lossless capture the VP9 passes read from, so they do not inherit H.264 artefacts
+VP9_CAPTURE_ENCODER = ("libx264", [], [], ["-c:v", "libx264", "-preset", "ultrafast", "-qp", "0", "-pix_fmt", "yuv420p"])
+
+# <link rel> values that name a favicon, most preferred first
+FAVICON_RELS = ["icon", "shortcut icon", "apple-touch-icon"]
+
+# Well-known icon locations probed alongside the <link> candidates
+FAVICON_FALLBACK_PATHS = ["/favicon.ico", "/apple-touch-icon.png"]
+
+# Preferred favicon formats, best first; other extensions rank after these
+FAVICON_EXT_RANK = {".svg": 0, ".png": 1, ".ico": 2}
+
+# Favicon Content-Types mapped to file extensions; the URL suffix is only used when the header is missing or unknown
+FAVICON_CONTENT_TYPES = {
+    "image/svg+xml": ".svg", "image/png": ".png", "image/x-icon": ".ico", "image/vnd.microsoft.icon": ".ico",
+    "image/jpeg": ".jpg", "image/gif": ".gif", "image/webp": ".webp",
+}
+
+# <meta> name/property values mapped to their metadata.json keys
+META_KEYS = {"description": "description", "keywords": "keywords", "og:title": "og_title", "og:description": "og_description", "og:image": "og_image"}
+
+# Archive members worth deflating; everything else is stored as-is
+TEXT_EXTENSIONS = (".md", ".json")
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "media-kit"
+
+# Favicons are kept here between runs and revalidated with ETag / Last-Modified
+FAVICON_CACHE_DIR = CACHE_DIR / "favicons"
+
+# Reused Chromium profile, so the HTTP, V8 code and shader caches stay warm across runs.
+# Cookies and site storage are cleared on every launch so they cannot affect the captures.
+BROWSER_PROFILE_DIR = CACHE_DIR / "chromium"
+
+# Origins the reused profile has loaded, so their site data can be wiped on the next launch
+# even when the target redirected to another host
+SITE_ORIGINS_FILE = CACHE_DIR / "chromium-origins.json"
+
+# Per-origin site data wiped from the reused profile before navigating (HTTP and shader caches are kept)
+SITE_STORAGE_TYPES = "cookies,local_storage,indexeddb,websql,file_systems,service_workers,cache_storage"
+
+# Largest size screencast frames are captured at; bigger outputs are upscaled by ffmpeg,
+# which is much cheaper than capturing and compressing every frame at 1080p
+MAX_RECORD_SIZE = (1280, 720)
+
+
+def parse_resolution(value):
+    """Parse a WIDTHxHEIGHT string for argparse."""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid resolution '{value}', expected WIDTHxHEIGHT")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"invalid resolution '{value}', expected WIDTHxHEIGHT")
+    # H.264 with yuv420p needs even dimensions
+    if width % 2 or height % 2:
+        raise argparse.ArgumentTypeError(f"invalid resolution '{value}', width and height must be even")
+    return width, height
+
 
 class MediaKitGenerator:
-    def __init__(self, url, delay=1):
+    def __init__(self, url, delay=1, video_resolution=MAX_RECORD_SIZE, video_codec="h264", browser_cache=True):
         self.url = self._normalize_url(url)
         self.delay = delay
+        # H.264 with yuv420p needs even dimensions, so round down for callers that skip parse_resolution
+        self.video_resolution = tuple(max(2, side // 2 * 2) for side in video_resolution)
+        self.video_codec = video_codec
+        self.browser_cache = browser_cache
+        self.record_size = self._recording_size(self.video_resolution)
+        # Scratch space for the video only; everything else is written straight into the zip
         self.output_dir = "media_kit"
+        self.out = Path(self.output_dir)
+        # Archive member folders
+        self.shots = PurePosixPath("screenshots")
+        self.assets = PurePosixPath("assets")
         self.start_time = datetime.now()
+        self.zip_path = f"media_kit_{self.start_time.strftime('%Y%m%d_%H%M%S')}.zip"
+        self.zf = None
+        self.video_name = None
         self.playwright = None
         self.browser = None
+        self.context = None
+        self.page = None
+        self.http = None
+        self._fetch_lock = None
+        self._lookups = None
+        self._fetched = False
+        self._doc = None
 
     async def __aenter__(self):
-        """Async context manager to launch the browser."""
-        print("🚀 Launching browser via Playwright...")
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
+        """Async context manager to launch the browser and open the target page once."""
+        try:
+            await self._open()
+        except BaseException:
+            # __aexit__ is not called when __aenter__ fails, so tear down what was created
+            await self._close(failed=True)
+            raise
         return self
 
+    async def _open(self):
+        """Create the archive, browser page and HTTP client used by generate()."""
+        started = time.perf_counter()
+        self._create_directories()
+        self.zf = zipfile.ZipFile(self.zip_path, "w", compression=zipfile.ZIP_STORED)
+        # One pooled HTTP/2 client, so the page, favicon and any redirects share a TLS connection
+        self.http = httpx.AsyncClient(http2=True, timeout=10, follow_redirects=True)
+        self._fetch_lock = asyncio.Lock()
+        # Favicon and metadata only need HTTP, so start them now to overlap the browser launch
+        # and page load; generate() awaits the task
+        self._lookups = asyncio.create_task(self._collect_page_info())
+        self.playwright = await async_playwright().start()
+        # The screenshots and scroll video reuse the page loaded here instead of navigating again
+        record_width, record_height = self.record_size
+        viewport = {"width": record_width, "height": record_height}
+        if self.browser_cache:
+            try:
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=BROWSER_PROFILE_DIR, headless=True, viewport=viewport
+                )
+            except PlaywrightError as e:
+                # Most often another run holds the profile lock
+                logger.warning("⚠️  Browser profile unavailable, launching without it: %s", str(e).splitlines()[0])
+        if self.context:
+            # A persistent context starts with a blank page already open
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+            await self._clear_site_state()
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.context = await self.browser.new_context(viewport=viewport)
+            self.page = await self.context.new_page()
+        try:
+            await self.page.goto(self.url, wait_until='load', timeout=15000)
+            # Sites with analytics pings or websockets may never go idle, so only wait briefly
+            try:
+                await self.page.wait_for_load_state('networkidle', timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+        except Exception as e:
+            logger.error("❌ Navigation error: %s", e)
+        if not self.browser:
+            self._save_site_origins(self._site_origins(frame.url for frame in self.page.frames) | self._site_origins([self.url]))
+        logger.info("🚀 Browser launched and page loaded in %.2fs", time.perf_counter() - started)
+
+    async def _clear_site_state(self):
+        """Drop cookies and the site storage of every origin earlier runs loaded, leaving the caches warm."""
+        await self.context.clear_cookies()
+        origins = self._load_site_origins() | self._site_origins([self.url])
+        # Keep the list until navigation records this run's origins, in case the run dies first
+        self._save_site_origins(origins)
+        session = await self.context.new_cdp_session(self.page)
+        try:
+            for origin in sorted(origins):
+                await session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": SITE_STORAGE_TYPES})
+        finally:
+            await session.detach()
+
+    def _site_origins(self, urls):
+        """Return the http(s) origins of urls, adding the https variant of plain http ones."""
+        origins = set()
+        for url in urls:
+            parsed = urlparse(url)
+            if parsed.scheme in ("http", "https") and parsed.netloc:
+                # The target may redirect from http to https
+                origins.update({f"{parsed.scheme}://{parsed.netloc}", f"https://{parsed.netloc}"})
+        return origins
+
+    def _load_site_origins(self):
+        """Return the origins recorded by the previous run, or an empty set."""
+        try:
+            return set(json.loads(SITE_ORIGINS_FILE.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return set()
+
+    def _save_site_origins(self, origins):
+        """Record the origins whose site data the reused profile may now hold."""
+        try:
+            SITE_ORIGINS_FILE.write_text(json.dumps(sorted(origins)), encoding="utf-8")
+        except OSError as e: logger.warning("⚠️  Could not record browser origins: %s", e)
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager to close the browser."""
+        await self._close(failed=exc_type is not None)
+
+    async def _close(self, failed):
+        """Release everything _open created; a failed run also discards its partial archive."""
+        if self._lookups and not self._lookups.done():
+            self._lookups.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._lookups
+        if self.context:
+            await self.context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
-        print("✅ Browser closed.")
+        if self.http:
+            await self.http.aclose()
+        if self.zf:
+            self.zf.close()
+            if failed:
+                Path(self.zip_path).unlink(missing_ok=True)
+        if failed:
+            shutil.rmtree(self.out, ignore_errors=True)
+        logger.debug("Browser closed")
 
     def _normalize_url(self, url):
         """Ensure URL has proper scheme."""
@@ -47,50 +252,115 @@ class MediaKitGenerator:
             url = "http://" + url
         return url
 
+    def _recording_size(self, resolution):
+        """Fit the requested video resolution within MAX_RECORD_SIZE, keeping its aspect ratio."""
+        width, height = resolution
+        scale = min(1, MAX_RECORD_SIZE[0] / width, MAX_RECORD_SIZE[1] / height)
+        # Scaling can make even sizes odd again
+        return max(2, round(width * scale) // 2 * 2), max(2, round(height * scale) // 2 * 2)
+
     def _create_directories(self):
-        """Create output directories."""
-        if os.path.exists(self.output_dir):
-            shutil.rmtree(self.output_dir)
-        os.makedirs(os.path.join(self.output_dir, "screenshots"))
-        os.makedirs(os.path.join(self.output_dir, "assets"))
+        """Reset the scratch directory left over from a previous run."""
+        if self.out.exists():
+            # Renaming is instant; the actual delete overlaps with the browser launch. A fresh
+            # mkdtemp() parent can never collide with leftovers from an earlier run
+            trash = Path(tempfile.mkdtemp(prefix=f"{self.out.name}.old.", dir=self.out.parent))
+            self.out.rename(trash / self.out.name)
+        # The delete thread dies with the interpreter, so also sweep anything it left behind before
+        threading.Thread(target=self._sweep_old_directories, daemon=True).start()
+        self.out.mkdir()
+
+    def _sweep_old_directories(self):
+        """Delete every scratch directory renamed away by this or an earlier run."""
+        for old in self.out.parent.glob(f"{self.out.name}.old.*"):
+            shutil.rmtree(old, ignore_errors=True)
+
+    def _write_member(self, arcname, data):
+        """Write bytes or text into the archive under a PurePosixPath, deflating only text members."""
+        # PNG, MP4 and favicon data are already compressed, so only deflate the text files
+        if arcname.suffix in TEXT_EXTENSIONS:
+            self.zf.writestr(str(arcname), data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+        else:
+            self.zf.writestr(str(arcname), data)
 
     async def take_screenshots(self):
         """Take screenshots for different viewports using Playwright."""
-        print("📸 Taking screenshots with Playwright...")
+        started = time.perf_counter()
         viewports = {"desktop": (1920, 1080), "tablet": (768, 1024), "mobile": (375, 667)}
-        page = await self.browser.new_page()
+        # Resizing the already-loaded page only re-lays it out, which is much cheaper
+        # than navigating a fresh page per viewport
+        page = self.page
+        saved = []
         try:
-            await page.goto(self.url, wait_until='networkidle')
             await page.wait_for_timeout(self.delay * 1000)
             for device, (width, height) in viewports.items():
-                print(f"  📱 Capturing {device} view ({width}x{height})...")
                 await page.set_viewport_size({"width": width, "height": height})
-                screenshot_path = os.path.join(self.output_dir, "screenshots", f"{device}.png")
-                await page.screenshot(path=screenshot_path)
-                print(f"  ✓ {device} screenshot saved")
+                screenshot = await page.screenshot(clip={"x": 0, "y": 0, "width": width, "height": height}, full_page=False)
+                self._write_member(self.shots / f"{device}.png", screenshot)
+                saved.append(device)
         except Exception as e:
-            print(f"  ❌ Screenshot error: {e}")
-        finally:
-            await page.close()
+            logger.error("❌ Screenshot error: %s", e)
+        if saved:
+            logger.info("📸 Screenshots: %s in %.2fs", ", ".join(saved), time.perf_counter() - started)
 
-    # <<< THIS IS THE NEW, VASTLY SUPERIOR VIDEO RECORDER >>>
     async def record_scroll_video(self):
-        """Record a smooth scroll video using Playwright's built-in recorder."""
-        print("📹 Recording scroll video with built-in Playwright recorder...")
-        
-        # Playwright records to a temporary directory. We'll move it later.
-        temp_video_dir = os.path.join(self.output_dir, "temp_video")
-        os.makedirs(temp_video_dir)
-        
-        context = None
+        """Record a smooth scroll video by piping a CDP screencast into ffmpeg."""
+        started = time.perf_counter()
+        available = await self._available_encoders()
+        encoder = None
+        use_vp9 = self.video_codec == "vp9"
+        if use_vp9:
+            if "libvpx-vp9" in available:
+                encoder = await self._pick_h264_encoder([VP9_CAPTURE_ENCODER], available)
+            if not encoder:
+                logger.warning("⚠️  libvpx-vp9 or libx264 unavailable, recording H.264 instead")
+                use_vp9 = False
+        if not use_vp9:
+            encoder = await self._pick_h264_encoder(H264_ENCODERS, available)
+        if not encoder:
+            logger.warning("❌ No working ffmpeg H.264 encoder found, skipping video")
+            shutil.rmtree(self.out)
+            return
+
+        name, input_args, filters, output_args = encoder
+        encoded_video_path = self.out / ("capture.mp4" if use_vp9 else "scroll_demo.mp4")
+        # Frames arrive whenever the page repaints, so stamp them on arrival and let ffmpeg
+        # resample to a constant 30 fps
+        ffmpeg = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *input_args,
+            "-f", "image2pipe", "-use_wallclock_as_timestamps", "1", "-c:v", "mjpeg", "-i", "-",
+            "-vf", ",".join(["scale={}:{}:flags=lanczos".format(*self.video_resolution)] + filters),
+            *output_args, "-r", "30", "-movflags", "+faststart", str(encoded_video_path),
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        # Drain stderr alongside the capture so a chatty ffmpeg cannot block on a full pipe
+        ffmpeg_errors = asyncio.create_task(ffmpeg.stderr.read())
+        session = None
+        stopped = asyncio.Event()
+        page = self.page
         try:
-            context = await self.browser.new_context(
-                record_video_dir=temp_video_dir,
-                record_video_size={"width": 1920, "height": 1080},
-                viewport={"width": 1920, "height": 1080}
-            )
-            page = await context.new_page()
-            await page.goto(self.url, wait_until='networkidle')
+            # Restore the capture viewport after the screenshots resized it
+            record_width, record_height = self.record_size
+            await page.set_viewport_size({"width": record_width, "height": record_height})
+            await page.evaluate("window.scrollTo(0, 0)")
+
+            session = await self.context.new_cdp_session(page)
+
+            async def on_frame(params):
+                # Frames still in flight after shutdown must not touch the closed pipe or detached session
+                if stopped.is_set():
+                    return
+                try:
+                    ffmpeg.stdin.write(base64.b64decode(params["data"]))
+                    await ffmpeg.stdin.drain()
+                    # Chromium sends the next frame only after this ack, so a slow encoder throttles capture
+                    if not stopped.is_set():
+                        await session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+                except (BrokenPipeError, ConnectionResetError, PlaywrightError):
+                    pass
+
+            session.on("Page.screencastFrame", on_frame)
+            await session.send("Page.startScreencast", {"format": "jpeg", "quality": 80, "maxWidth": record_width, "maxHeight": record_height})
 
             # Use JavaScript evaluation to perform a smooth scroll over 10 seconds
             await page.evaluate("""
@@ -113,90 +383,225 @@ class MediaKitGenerator:
                     });
                 }
             """)
-            print("  ✓ Scroll animation complete.")
 
         except Exception as e:
-            print(f"  ❌ An error occurred during video recording: {e}")
+            logger.error("❌ An error occurred during video recording: %s", e)
         finally:
-            if context:
-                await context.close() # This saves the video
-        
-        # Move the recorded video to the final destination
+            stopped.set()
+            if session:
+                session.remove_listener("Page.screencastFrame", on_frame)
+                try:
+                    await session.send("Page.stopScreencast")
+                    await session.detach()
+                except Exception:
+                    pass
+            ffmpeg.stdin.close()
+            returncode = await ffmpeg.wait()
+            stderr = (await ffmpeg_errors).decode(errors="replace").strip()
+
+        # Add the encoded video to the archive
         try:
-            video_files = os.listdir(temp_video_dir)
-            if video_files:
-                temp_video_path = os.path.join(temp_video_dir, video_files[0])
-                final_video_path = os.path.join(self.output_dir, "assets", "scroll_demo.mp4")
-                shutil.move(temp_video_path, final_video_path)
-                print("  ✓ Video saved successfully.")
-            shutil.rmtree(temp_video_dir)
+            if returncode == 0 and encoded_video_path.exists():
+                video_path, video_name, codec = encoded_video_path, "scroll_demo.mp4", f"H.264 via {name}"
+                if use_vp9:
+                    video_path, video_name, codec = self.out / "scroll_demo.webm", "scroll_demo.webm", "two-pass VP9"
+                    if not await self._encode_vp9_two_pass(encoded_video_path, video_path):
+                        # The lossless capture is far too large to ship in its place
+                        video_path = None
+                if video_path:
+                    self.video_name = video_name
+                    self.zf.write(video_path, str(self.assets / self.video_name))
+                    logger.info("📹 Scroll video: %s (%s) in %.2fs", self.video_name, codec, time.perf_counter() - started)
+                else:
+                    logger.error("❌ libvpx-vp9 encode failed, video not saved")
+            else:
+                logger.error("❌ ffmpeg exited with status %s, video not saved%s", returncode, f": {stderr}" if stderr else "")
+            shutil.rmtree(self.out)
         except Exception as e:
-            print(f"  ❌ Failed to move video file: {e}")
+            logger.error("❌ Failed to save video file: %s", e)
+
+    async def _encode_vp9_two_pass(self, src, dst):
+        """Re-encode src as two-pass VP9 WebM. Returns True on success."""
+        passlog = str(self.out / "vp9")
+        passes = [
+            ["-pass", "1", "-speed", "4", "-an", "-f", "null", "-"],
+            ["-pass", "2", "-speed", "2", str(dst)],
+        ]
+        for pass_args in passes:
+            proc = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-i", str(src),
+                *VP9_ARGS, "-passlogfile", passlog, *pass_args,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await proc.communicate()
+            if proc.returncode != 0:
+                logger.error("❌ libvpx-vp9 pass %s failed: %s", pass_args[1], stderr.decode(errors="replace").strip())
+                return False
+        return True
 
-    # The synchronous methods below remain unchanged
-    def get_favicon(self):
-        print("🔍 Getting favicon...")
+    async def _available_encoders(self):
+        """Return the set of encoder names the local ffmpeg build supports."""
         try:
-            response = requests.get(self.url, timeout=10)
-            soup = BeautifulSoup(response.text, "html.parser")
-            selectors = ['link[rel="icon"]', 'link[rel="shortcut icon"]', 'link[rel="apple-touch-icon"]']
-            favicon_url = None
-            for selector in selectors:
-                icon = soup.select_one(selector)
-                if icon and icon.get("href"):
-                    favicon_url = urljoin(self.url, icon["href"])
-                    break
-            if not favicon_url: favicon_url = urljoin(self.url, "/favicon.ico")
-            favicon_response = requests.get(favicon_url, timeout=10)
-            if favicon_response.status_code == 200:
-                ext = os.path.splitext(urlparse(favicon_url).path)[1] or ".ico"
-                favicon_path = os.path.join(self.output_dir, "assets", f"favicon{ext}")
-                with open(favicon_path, "wb") as f: f.write(favicon_response.content)
-                print(f"  ✓ Favicon saved as favicon{ext}")
+            proc = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-hide_banner", "-encoders",
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            return set()
+        stdout, _ = await proc.communicate()
+        return {line.split()[1] for line in stdout.decode(errors="ignore").splitlines() if len(line.split()) > 1}
+
+    async def _pick_h264_encoder(self, encoders, available):
+        """Return the first (encoder, input args, filters, output args) entry in available that can encode here."""
+        for name, input_args, filters, output_args in encoders:
+            if name not in available:
+                continue
+            # Listed encoders can still lack the hardware, and frames streamed into a
+            # failing encoder are lost, so probe each one with a tiny test encode first
+            proc = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-hide_banner", "-loglevel", "error", *input_args,
+                "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                *(["-vf", ",".join(filters)] if filters else []), *output_args, "-f", "null", "-",
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            if await proc.wait() == 0:
+                return name, input_args, filters, output_args
+        return None
+
+    async def _fetch_and_parse(self):
+        """Download and parse the page HTML once for favicon and metadata lookups."""
+        async with self._fetch_lock:
+            if self._fetched:
+                return
+            self._fetched = True
+            try:
+                response = await self.http.get(self.url)
+                # Only pass a charset the server declared; otherwise let the parser read <meta charset>
+                parser = lxml.html.HTMLParser(encoding=response.charset_encoding) if response.charset_encoding else None
+                try:
+                    self._doc = lxml.html.document_fromstring(response.content, parser=parser)
+                except lxml.etree.ParserError:
+                    # Empty or whitespace-only body: use an empty tree so metadata still gets its defaults
+                    self._doc = lxml.html.document_fromstring("<html></html>")
+            except Exception as e: logger.error("❌ Page fetch error: %s", e)
+
+    async def _collect_page_info(self):
+        """Fetch the favicon and extract metadata concurrently."""
+        await asyncio.gather(self.get_favicon(), self.extract_metadata())
+
+    async def get_favicon(self):
+        await self._fetch_and_parse()
+        try:
+            candidates = []
+            if self._doc is not None:
+                # One pass over the <link> tags, ordered by rel priority rather than document order
+                icons = self._doc.xpath('//link[@rel="icon" or @rel="shortcut icon" or @rel="apple-touch-icon"][@href]')
+                candidates = [urljoin(self.url, el.get("href")) for el in sorted(icons, key=lambda el: FAVICON_RELS.index(el.get("rel")))]
+            candidates += [urljoin(self.url, path) for path in FAVICON_FALLBACK_PATHS]
+            favicon_url = await self._pick_favicon_url(list(dict.fromkeys(candidates)))
+            cache_key = hashlib.sha1(urlparse(self.url).netloc.encode()).hexdigest()
+            cache_data_path = FAVICON_CACHE_DIR / f"{cache_key}.bin"
+            cache_meta_path = FAVICON_CACHE_DIR / f"{cache_key}.meta.json"
+            cached = self._load_favicon_cache(cache_meta_path, cache_data_path)
+            headers = {}
+            if cached and cached.get("url") == favicon_url:
+                if cached.get("etag"): headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"): headers["If-Modified-Since"] = cached["last_modified"]
+            favicon_response = await self.http.get(favicon_url, headers=headers)
+            if favicon_response.status_code == 304 and headers:
+                ext = cached["ext"]
+                self.zf.write(cache_data_path, str(self.assets / f"favicon{ext}"))
+                logger.info("🔍 Favicon: favicon%s (cached)", ext)
+            elif favicon_response.status_code == 200:
+                ext = self._favicon_extension(favicon_url, favicon_response) or ".ico"
+                self._write_member(self.assets / f"favicon{ext}", favicon_response.content)
+                logger.info("🔍 Favicon: favicon%s", ext)
+                self._store_favicon_cache(cache_meta_path, cache_data_path, favicon_url, ext, favicon_response)
             else:
-                print(f"  ❌ Favicon not found (status: {favicon_response.status_code})")
-        except Exception as e: print(f"  ❌ Favicon error: {e}")
+                logger.warning("❌ Favicon not found (status: %s)", favicon_response.status_code)
+        except Exception as e: logger.error("❌ Favicon error: %s", e)
+
+    async def _pick_favicon_url(self, candidates):
+        """HEAD every candidate at once and return the best-ranked image URL."""
+        responses = await asyncio.gather(*[self.http.head(url) for url in candidates], return_exceptions=True)
+        found = [
+            (url, response) for url, response in zip(candidates, responses)
+            if not isinstance(response, Exception) and response.status_code == 200
+            and response.headers.get("content-type", "").startswith("image/")
+        ]
+        if not found:
+            # Some servers reject HEAD, so fall back to a plain GET of the first candidate
+            return candidates[0]
+        # min() keeps the earliest candidate among equally ranked formats
+        url, _ = min(found, key=lambda item: FAVICON_EXT_RANK.get(self._favicon_extension(*item), len(FAVICON_EXT_RANK)))
+        return url
+
+    def _favicon_extension(self, url, response):
+        """Return the favicon file extension from the Content-Type, falling back to the URL suffix."""
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        return FAVICON_CONTENT_TYPES.get(content_type) or self._url_extension(url)
+
+    def _url_extension(self, url):
+        """Return the lower-cased file extension of a URL path, or an empty string."""
+        return PurePosixPath(urlparse(url).path).suffix.lower()
+
+    def _load_favicon_cache(self, meta_path, data_path):
+        """Return the cached favicon metadata, or None if there is no usable entry."""
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if data_path.exists() else None
+
+    def _store_favicon_cache(self, meta_path, data_path, url, ext, response):
+        """Save the favicon and its validators for revalidation on the next run."""
+        try:
+            FAVICON_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            data_path.write_bytes(response.content)
+            meta = {"url": url, "ext": ext, "etag": response.headers.get("etag"), "last_modified": response.headers.get("last-modified")}
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        except OSError as e: logger.warning("⚠️  Could not cache favicon: %s", e)
 
-    def extract_metadata(self):
-        print("📊 Extracting metadata...")
+    async def extract_metadata(self):
+        await self._fetch_and_parse()
+        if self._doc is None:
+            logger.error("❌ Metadata error: page HTML unavailable")
+            return
         try:
-            response = requests.get(self.url, timeout=10)
-            soup = BeautifulSoup(response.text, "html.parser")
-            metadata = {"url": self.url, "timestamp": self.start_time.isoformat(), "title": soup.title.string if soup.title else "No title", "description": "", "keywords": "", "og_title": "", "og_description": "", "og_image": "", "viewport_sizes": {"desktop": "1920x1080", "tablet": "768x1024", "mobile": "375x667"}}
-            meta_tags = {"description": soup.find("meta", attrs={"name": "description"}), "keywords": soup.find("meta", attrs={"name": "keywords"}), "og_title": soup.find("meta", attrs={"property": "og:title"}), "og_description": soup.find("meta", attrs={"property": "og:description"}), "og_image": soup.find("meta", attrs={"property": "og:image"})}
+            # One walk over <title> and <meta> elements; the first tag per key wins
+            title, meta_tags = None, {}
+            for el in self._doc.iter("title", "meta"):
+                if el.tag == "title":
+                    if title is None: title = el
+                elif key := META_KEYS.get(el.get("name")) or META_KEYS.get(el.get("property")):
+                    meta_tags.setdefault(key, el)
+            metadata = {"url": self.url, "timestamp": self.start_time.isoformat(), "title": title.text if title is not None else "No title", "description": "", "keywords": "", "og_title": "", "og_description": "", "og_image": "", "viewport_sizes": {"desktop": "1920x1080", "tablet": "768x1024", "mobile": "375x667"}}
             for key, tag in meta_tags.items():
-                if tag and (content := tag.get("content")):
+                if content := tag.get("content"):
                     metadata[key] = urljoin(self.url, content) if key == "og_image" else content
-            with open(os.path.join(self.output_dir, "metadata.json"), "w", encoding="utf-8") as f: json.dump(metadata, f, indent=2, ensure_ascii=False)
-            print("  ✓ Metadata extracted and saved")
-        except Exception as e: print(f"  ❌ Metadata error: {e}")
+            self._write_member(PurePosixPath("metadata.json"), json.dumps(metadata, indent=2, ensure_ascii=False))
+            logger.info("📊 Metadata: %d of %d meta tags found", len(meta_tags), len(META_KEYS))
+        except Exception as e: logger.error("❌ Metadata error: %s", e)
 
     def create_readme(self):
-        video_line = "- scroll_demo.mp4 - Scrolling demo video" if os.path.exists(os.path.join(self.output_dir, "assets", "scroll_demo.mp4")) else ""
+        video_line = f"- {self.video_name} - Scrolling demo video" if self.video_name else ""
         readme_content = f"""# Website Media Kit ...\n{video_line}\n..."""
-        with open(os.path.join(self.output_dir, "README.md"), "w") as f: f.write(readme_content)
+        self._write_member(PurePosixPath("README.md"), readme_content)
 
     def create_zip(self):
-        print("📦 Creating zip archive...")
-        zip_name = f"media_kit_{self.start_time.strftime('%Y%m%d_%H%M%S')}"
-        shutil.make_archive(zip_name, "zip", self.output_dir)
-        print(f"  ✓ Archive created: {zip_name}.zip")
-        return f"{zip_name}.zip"
+        """Finish the archive that the other steps have been writing into."""
+        self.zf.close()
+        return self.zip_path
 
     async def generate(self):
         """Generate the complete media kit using async methods."""
-        print(f"🚀 Generating media kit for: {self.url}\n" + "-" * 50)
-        self._create_directories()
-        await self.take_screenshots()
+        logger.info("🚀 Generating media kit for: %s", self.url)
+        # The favicon and metadata task started in __aenter__ keeps overlapping the screenshots
+        await asyncio.gather(self.take_screenshots(), self._lookups)
         await self.record_scroll_video()
-        self.get_favicon()
-        self.extract_metadata()
         self.create_readme()
         zip_file = self.create_zip()
-        print("-" * 50 + f"\n✅ Media kit generated successfully!")
-        print(f"📁 Folder: {self.output_dir}/")
-        print(f"📦 Archive: {zip_file}")
-        print(f"⏱️  Total time: {(datetime.now() - self.start_time).total_seconds():.1f}s")
+        logger.info("✅ Media kit generated: %s in %.1fs", zip_file, (datetime.now() - self.start_time).total_seconds())
 
 
 async def main():
@@ -207,22 +612,32 @@ async def main():
 Examples:
   python website_media_kit.py https://example.com
   python website_media_kit.py localhost:3000 --delay 2
+  python website_media_kit.py https://example.com --video-resolution 1920x1080
+  python website_media_kit.py https://example.com --video-codec vp9
 
 Requirements:
-  pip install playwright requests beautifulsoup4
+  pip install playwright "httpx[http2]" lxml
   python -m playwright install
         """
     )
     parser.add_argument("url", help="Website URL")
     parser.add_argument("--delay", type=int, default=1, help="Delay in seconds")
+    parser.add_argument("--video-codec", choices=["h264", "vp9"], default="h264", help="Scroll video codec: h264 (MP4, fast, hardware-accelerated when possible) or vp9 (two-pass WebM, much slower to encode)")
+    parser.add_argument("--video-resolution", type=parse_resolution, default=MAX_RECORD_SIZE, metavar="WxH", help="Scroll video resolution (default: 1280x720; larger sizes are upscaled with ffmpeg)")
+    parser.add_argument("--no-browser-cache", dest="browser_cache", action="store_false", help=f"Launch a fresh browser instead of reusing the profile in {BROWSER_PROFILE_DIR}")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only report warnings and errors")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
+    # httpx and httpcore log every request at INFO, which would drown out the progress lines
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
     try:
-        async with MediaKitGenerator(args.url, args.delay) as generator:
+        async with MediaKitGenerator(args.url, args.delay, args.video_resolution, args.video_codec, args.browser_cache) as generator:
             await generator.generate()
     except KeyboardInterrupt:
-        print("\n❌ Operation cancelled by user")
+        logger.error("❌ Operation cancelled by user")
     except Exception as e:
-        print(f"\n❌ An unexpected error occurred: {e}")
+        logger.error("❌ An unexpected error occurred: %s", e)
 
 
 if __name__ == "__main__":